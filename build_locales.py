@@ -0,0 +1,31 @@
+# build_locales.py
+# Bundles all language files into one preparsed file for the PyInstaller build.
+import os
+import sys
+import json
+import pickle
+
+import config
+
+def build_locales_bundle():
+    """Parses lang/<code>.json for every supported language and writes lang/locales.pkl."""
+    locales = {}
+    for lang_code in config.SUPPORTED_LANGS:
+        filepath = os.path.join(config.LANG_DIR, f"{lang_code}.json")
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                locales[lang_code] = json.load(f)
+        except FileNotFoundError:
+            print(f"Warning: Language file not found, skipping: {filepath}")
+        except json.JSONDecodeError as e:
+            print(f"ERROR: Failed to parse language file {filepath}: {e}")
+            return False
+
+    bundle_path = os.path.join(config.LANG_DIR, config.LOCALES_BUNDLE_FILENAME)
+    with open(bundle_path, 'wb') as f:
+        pickle.dump(locales, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"Wrote {len(locales)} languages to {bundle_path}")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if build_locales_bundle() else 1)
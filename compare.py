@@ -13,13 +13,10 @@ import translation # Import the new translation module
 from utils import clean_sql_identifier, get_resource_path
 
 # --- Data Fetching & Formatting for Comparison ---
-def get_formatted_car_data_for_compare(tg_code):
-    """Fetches raw data and returns formatted data for a single car."""
-    raw_data = database.search_by_tg_code(tg_code)
-    if not raw_data:
-        return None
-    # formatting.py now handles value translations
-    return formatting.format_vehicle_data(raw_data)
+def get_formatted_cars_data_for_compare(tg_codes):
+    """Fetches raw data for all cars in one query; returns the formatted data per code (None if not found)."""
+    raw_rows = database.search_by_tg_codes(tg_codes)
+    return [formatting.format_vehicle_data(raw_rows[code]) if code in raw_rows else None for code in tg_codes]
 
 # --- PDF Generation Class (Specific to Comparison) ---
 class PDFCompare(FPDF):
@@ -206,9 +203,8 @@ def main():
     # Initialize translations for CLI run (using default language)
     translation.initialize_translations()
 
-    for tg_code in tg_codes_input:
-        print(f"Suche und formatiere Daten für TG-Code: {tg_code}...")
-        formatted_data = get_formatted_car_data_for_compare(tg_code)
+    print(f"Suche und formatiere Daten für TG-Codes: {', '.join(tg_codes_input)}...")
+    for tg_code, formatted_data in zip(tg_codes_input, get_formatted_cars_data_for_compare(tg_codes_input)):
         if formatted_data:
             print(f" -> Daten für {tg_code} gefunden und formatiert.")
             all_formatted_data.append(formatted_data)
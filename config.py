@@ -1,8 +1,9 @@
 # config.py
 import os
-import re
 import sys # <--- Import sys
 
+from utils import clean_sql_identifier
+
 # --- Determine Base Directory ---
 # If running as a bundled executable (frozen), use the directory of the executable.
 # Otherwise (running as script), use the directory of this config file.
@@ -32,6 +33,7 @@ INPUT_FILE_PATH = os.path.join(DATA_DIR, INPUT_FILENAME) # Downloaded file in DA
 # Define them relative to the original script structure.
 _SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__)) # Original script dir
 LANG_DIR = os.path.join(_SCRIPT_DIR, "lang")
+LOCALES_BUNDLE_FILENAME = "locales.pkl" # All languages preparsed by build_locales.py (built executable only)
 FONT_DIR = os.path.join(_SCRIPT_DIR, "fonts")
 FONT_REGULAR_PATH = os.path.join(FONT_DIR, "DejaVuSans.ttf")
 FONT_BOLD_PATH = os.path.join(FONT_DIR, "DejaVuSans-Bold.ttf")
@@ -46,10 +48,19 @@ DOWNLOAD_URL = "https://opendata.astra.admin.ch/ivzod/2000-Typengenehmigungen_TG
 STARTUP_CHECK_TIMEOUT = 10 # Seconds for the initial HEAD request check
 DOWNLOAD_TIMEOUT = 3600     # Seconds for the full file download
 
+# --- Download Settings ---
+DOWNLOAD_PARTS = 4 # Parallel HTTP range requests (1 disables parallel download)
+DOWNLOAD_PARALLEL_MIN_SIZE = 4 * 1024 * 1024 # Smaller files are downloaded in one request
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024 # Bytes copied per read while streaming to disk
+
 # --- Importer Settings ---
 FILE_ENCODING = 'windows-1252'
 DB_ENCODING = 'utf-8'
 DELIMITER = '\t'
+IMPORT_BATCH_SIZE = 5000 # Rows per executemany() call during import
+IMPORT_COMMIT_INTERVAL = 50000 # Rows per transaction during import
+IMPORT_CACHED_STATEMENTS = 1000 # Prepared statement cache of the import connection
+IMPORT_PROGRESS_INTERVAL = 0.1 # Minimum seconds between progress updates during import
 NORMALIZE_COLUMNS = [
     "Marke", "Getriebe", "Motormarke", "Motortyp", "Treibstoff",
     "Abgasreinigung", "Antrieb", "Anzahl_Achsen_Räder", "AbgasCode",
@@ -69,10 +80,6 @@ UNITS_MAP = {
 # Conversion factor
 KW_TO_PS = 1.35962
 
-# Date Formats
-HOMOLOGATIONSDATUM_INPUT_FORMAT = '%Y%m%d'
-HOMOLOGATIONSDATUM_OUTPUT_FORMAT = '%d.%m.%Y'
-
 # Columns to Omit from general display/export (Original names)
 OMIT_COLUMNS_ORIGINAL = [
     "ET_CO", "ET_NMHC", "ET_NOx", "ET_PA", "ET_PA_Exp", "ET_PM",
@@ -80,7 +87,7 @@ OMIT_COLUMNS_ORIGINAL = [
     "ScCo2", "ScConsumption", "ScNh3", "ScNo2", "TC_CO2", "TC_Consumption",
     "TC_NH3", "TC_NO2", "ZT_CO", "ZT_NMHC", "ZT_NOx", "ZT_PA", "ZT_PA_Exp",
     "ZT_PM", "ZT_THC", "ZT_THC_NOx", "ZT_T_IV_THC", "ZT_T_VI_CO", "ZT_T_VI_THC",
-    "ZT_NMHC", "ZT_NOx", "ZT_AbgasCode"
+    "ZT_AbgasCode"
 ]
 
 # Desired Display Order with Dividers (Original names)
@@ -114,6 +121,7 @@ PDF_DIVIDER_MARGIN = 3
 
 # --- GUI Settings ---
 DEFAULT_LANG = "en"
+LANG_DETECTION_TIMEOUT = 1.0 # Seconds to wait for the system language before building the UI
 SUPPORTED_LANGS = {
     "en": "English",
     "de": "Deutsch",
@@ -133,17 +141,8 @@ SUPPORTED_LANGS = {
 }
 
 # --- Derived Constants ---
-def _clean_sql_identifier_local(name):
-    """Cleans a string to be a valid SQL identifier (table/column name)."""
-    if not isinstance(name, str): return ""
-    name = re.sub(r'[ /.\-+()]+', '_', name)
-    name = name.replace('ET_THC_NOx', 'ET_THC_NOx')
-    name = name.replace('ZT_THC_NOx', 'ZT_THC_NOx')
-    name = name.strip('_')
-    if name and name[0].isdigit(): name = '_' + name
-    return name
-
-OMIT_COLUMNS_CLEANED = set(_clean_sql_identifier_local(col) for col in OMIT_COLUMNS_ORIGINAL)
+# Built once at import with the shared (memoized) cleaner; utils does not import config
+OMIT_COLUMNS_CLEANED = frozenset(map(clean_sql_identifier, OMIT_COLUMNS_ORIGINAL))
 
 # --- Final Check and Print ---
 print(f"INFO: Database path set to: {DATABASE_PATH}")
@@ -1,8 +1,13 @@
 # database.py
 import sqlite3
 import os
+import atexit
+import pathlib
 import csv
 import codecs
+import time
+from functools import lru_cache
+from itertools import islice
 
 # Import constants and utils
 import config
@@ -20,13 +25,38 @@ def get_db_connection():
         print(f"Database connection error: {e}")
         raise # Re-raise the exception
 
+def get_import_connection():
+    """
+    Establishes and returns a connection tuned for the bulk import: autocommit mode
+    (transactions are managed explicitly), plain tuple rows and a larger statement cache.
+    Foreign keys are not enforced; the import resolves all ids itself.
+    """
+    try:
+        conn = sqlite3.connect(config.DATABASE_PATH, isolation_level=None, cached_statements=config.IMPORT_CACHED_STATEMENTS)
+        # WAL avoids the rollback journal rewrite, NORMAL skips the fsync per commit
+        conn.executescript("""
+            PRAGMA foreign_keys = OFF;
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -131072;
+            PRAGMA mmap_size = 268435456;
+        """)
+        return conn
+    except sqlite3.Error as e:
+        print(f"Database connection error: {e}")
+        raise # Re-raise the exception
+
 # --- Schema Management ---
 def create_schema(cursor):
     """Creates the necessary tables in the database."""
     print("Creating database schema...")
     normalized_table_mapping = {} # Store mapping for FK constraints
 
-    # 1. Create Normalized Tables
+    # Drop the main table first; it references the normalized tables
+    cursor.execute("DROP TABLE IF EXISTS Emissionen;")
+
+    # 1. Create Normalized Tables (rebuilt on every import, ids are assigned by populate_normalized_tables)
     for col_name in config.NORMALIZE_COLUMNS:
         clean_col_name = clean_sql_identifier(col_name)
         table_name = create_normalized_table_name(clean_col_name)
@@ -34,14 +64,15 @@ def create_schema(cursor):
         col_name_id = f"{clean_col_name}_id"
         normalized_table_mapping[col_name] = (table_name, col_name_id)
 
+        cursor.execute(f"DROP TABLE IF EXISTS {table_name};")
+        # The UNIQUE index on name is added by create_indexes() after the bulk load
         create_table_sql = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL
+        CREATE TABLE {table_name} (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL
         );
         """
         cursor.execute(create_table_sql)
-        # print(f"  - Ensured normalized table exists: {table_name}") # Less verbose
 
     # 2. Create Main 'Emissionen' Table
     main_table_sql = "CREATE TABLE IF NOT EXISTS Emissionen (\n"
@@ -88,138 +119,167 @@ def create_schema(cursor):
     main_table_sql += ",\n".join(column_definitions)
     main_table_sql += "\n);"
 
-    # Drop existing table if it exists before creating
-    cursor.execute("DROP TABLE IF EXISTS Emissionen;")
     cursor.execute(main_table_sql)
     print("Schema creation complete.")
     return header_map, normalized_table_mapping # Return mappings needed for insertion
 
+def create_indexes(cursor, normalized_table_mapping):
+    """Creates the indexes that are deferred until after the bulk load."""
+    print("Creating indexes...")
+    for table_name, _ in normalized_table_mapping.values():
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table_name}_name ON {table_name} (name);")
+    # Populate sqlite_stat1 so the query planner knows the table and index sizes
+    cursor.execute("ANALYZE;")
+
 # --- Data Insertion ---
-def get_or_insert_normalized_id(cursor, table_name, value, cache):
-    """Gets the ID for a value in a normalized table, inserting if needed."""
-    if value is None or value == '':
-        value = '(leer)' # Use placeholder for empty/null values
-
-    cache_key = (table_name, value)
-    if cache_key in cache:
-        return cache[cache_key]
-
-    # Check if value exists
-    select_sql = f"SELECT id FROM {table_name} WHERE name = ?"
-    cursor.execute(select_sql, (value,))
-    result = cursor.fetchone()
-
-    if result:
-        id_ = result[0]
-        cache[cache_key] = id_
-        return id_
-    else:
-        # Insert new value
-        insert_sql = f"INSERT INTO {table_name} (name) VALUES (?)"
-        try:
-            cursor.execute(insert_sql, (value,))
-            id_ = cursor.lastrowid
-            cache[cache_key] = id_
-            return id_
-        except sqlite3.IntegrityError:
-            # Handle rare race condition or unexpected unique constraint violation
-            print(f"Warning: Integrity error inserting '{value}' into {table_name}. Re-fetching ID.")
-            cursor.execute(select_sql, (value,)) # Re-fetch after potential concurrent insert
-            result = cursor.fetchone()
-            if result:
-                 id_ = result[0]
-                 cache[cache_key] = id_
-                 return id_
-            else:
-                 # This shouldn't happen if IntegrityError occurred, but raise if it does
-                 raise ValueError(f"Could not get or insert ID for '{value}' in {table_name} after IntegrityError.")
-
-
-def insert_data(conn, reader, header_map, normalized_table_mapping, total_rows, progress_callback=None):
-    """Inserts data from the CSV reader into the Emissionen table."""
+def populate_normalized_tables(cursor, reader, header_map, normalized_table_mapping):
+    """
+    Collects the distinct values of all normalized columns in one pass over the CSV reader,
+    numbering them in order of first appearance, bulk-inserts them into the (empty) normalized
+    tables and returns a dict mapping table_name -> {value: id}.
+    """
+    col_index = {original_col: index for index, original_col in enumerate(header_map)} # Positions in each CSV row
+    tg_code_index = col_index.get("TG-Code")
+    normalized_columns = [
+        (col_index[original_col], table_name)
+        for original_col, (table_name, _) in normalized_table_mapping.items()
+        if original_col in col_index
+    ]
+    normalized_ids = {table_name: {} for _, table_name in normalized_columns}
+    columns = [(index, normalized_ids[table_name]) for index, table_name in normalized_columns]
+
+    for row in reader:
+        # Skip rows that insert_data() will reject anyway
+        if len(row) != len(col_index): continue
+        if tg_code_index is not None and not row[tg_code_index]: continue
+        for index, ids in columns:
+            value = row[index] or '(leer)' # Use placeholder for empty values
+            ids.setdefault(value, len(ids) + 1)
+
+    cursor.execute("BEGIN")
+    for table_name, ids in normalized_ids.items():
+        cursor.executemany(f"INSERT INTO {table_name} (id, name) VALUES (?, ?)", ((id_, name) for name, id_ in ids.items()))
+    cursor.execute("COMMIT")
+    print(f"Normalized tables populated with {sum(len(ids) for ids in normalized_ids.values())} distinct values.")
+    return normalized_ids
+
+
+def _flush_batch(cursor, insert_sql, batch):
+    """Inserts a batch of rows with executemany() inside a savepoint. Returns the number of rows that failed."""
+    failed_count = 0
+    cursor.execute("SAVEPOINT import_batch")
+    try:
+        cursor.executemany(insert_sql, batch)
+    except sqlite3.Error as batch_err:
+        # Undo the partial batch and retry row by row; a failing INSERT only rolls back itself
+        print(f"Warning: Batch insert failed ({batch_err}). Retrying {len(batch)} rows individually.")
+        cursor.execute("ROLLBACK TO import_batch")
+        for values in batch:
+            try:
+                cursor.execute(insert_sql, values)
+            except sqlite3.Error as row_err:
+                print(f"Error inserting row: {row_err}. Skipping.")
+                failed_count += 1
+    cursor.execute("RELEASE import_batch")
+    return failed_count
+
+
+def insert_data(conn, reader, header_map, normalized_table_mapping, normalized_ids, total_rows, progress_callback=None):
+    """
+    Inserts data from the CSV reader into the Emissionen table.
+    normalized_ids comes from populate_normalized_tables() and must cover every normalized value.
+    Expects a connection in autocommit mode (isolation_level=None); transactions are managed explicitly.
+    """
     cursor = conn.cursor()
-    normalization_cache = {}
     inserted_count = 0
     skipped_count = 0
-    progress_update_frequency = max(1, total_rows // 100) if total_rows > 0 else 100 # Update frequency
+    rows_read = 0
 
-    original_headers = list(header_map.keys())
+    col_index = {original_col: index for index, original_col in enumerate(header_map)} # Positions in each CSV row
+    tg_code_index = col_index.get("TG-Code")
 
-    # Prepare INSERT statement dynamically based on header_map and normalized_mapping
+    # Prepare INSERT statement and the per-column plan once: (csv index, {value: id} or None for plain columns)
     main_table_cols_quoted = []
     placeholders = []
-    original_headers_for_insert_order = [] # Maintain order for value extraction
+    plan = []
 
-    for original_col in original_headers:
-        clean_col = header_map.get(original_col)
+    for original_col, index in col_index.items():
+        clean_col = header_map[original_col]
         if not clean_col: continue # Skip if column was invalid
 
         if original_col in config.NORMALIZE_COLUMNS and original_col in normalized_table_mapping:
             # Use the ID column name
-            _, col_name_id = normalized_table_mapping[original_col]
+            table_name, col_name_id = normalized_table_mapping[original_col]
             main_table_cols_quoted.append(f'"{col_name_id}"')
+            plan.append((index, normalized_ids[table_name]))
         else:
             # Use the cleaned column name
             main_table_cols_quoted.append(f'"{clean_col}"')
+            plan.append((index, None))
 
         placeholders.append("?")
-        original_headers_for_insert_order.append(original_col) # Keep track of which original col corresponds to placeholder
 
     insert_sql = f"INSERT OR REPLACE INTO Emissionen ({', '.join(main_table_cols_quoted)}) VALUES ({', '.join(placeholders)})"
     # print(f"DEBUG Insert SQL: {insert_sql}") # Optional debug
 
-    for i, row in enumerate(reader):
-        current_row_num = i + 1 # 1-based index for progress reporting
-
-        if len(row) != len(original_headers):
-            print(f"Warning: Skipping row {current_row_num+1} due to incorrect number of columns (expected {len(original_headers)}, got {len(row)}).")
-            skipped_count += 1
-            continue
-
-        row_data = dict(zip(original_headers, row)) # Map current row values by original header name
-        values_to_insert = []
-
-        try:
-            # Build the list of values in the correct order for the INSERT statement
-            for original_col in original_headers_for_insert_order:
-                value = row_data.get(original_col) # Get value using original header name
-
-                if original_col == "TG-Code":
-                    if not value: raise ValueError(f"TG-Code is empty in row {current_row_num+1}")
-                    values_to_insert.append(value)
-                elif original_col in config.NORMALIZE_COLUMNS and original_col in normalized_table_mapping:
-                    table_name, _ = normalized_table_mapping[original_col]
-                    normalized_id = get_or_insert_normalized_id(cursor, table_name, value, normalization_cache)
-                    values_to_insert.append(normalized_id)
-                else:
-                    # For non-normalized columns, insert the value directly (or empty string)
-                    values_to_insert.append(value if value is not None else '')
-
-            # Execute the insert
-            cursor.execute(insert_sql, tuple(values_to_insert))
-            inserted_count += 1
-
-            # Call progress callback periodically
-            if progress_callback and (current_row_num % progress_update_frequency == 0 or current_row_num == total_rows):
-                progress_callback(current_row=current_row_num, total_rows=total_rows)
-
-            # Commit periodically
-            if current_row_num % 5000 == 0:
-                conn.commit()
-                # print(f"  ... committed {inserted_count} rows ...") # Less verbose
-
-        except (ValueError, sqlite3.IntegrityError) as data_err:
-            print(f"Error processing row {current_row_num+1}: {data_err}. Skipping.")
-            skipped_count += 1
-            conn.rollback() # Rollback transaction for the failed row
-            # No need to clear cache or reset PRAGMA here, just continue
-        except Exception as e:
-            print(f"Unexpected error processing row {current_row_num+1}: {e}. Skipping.")
-            skipped_count += 1
-            conn.rollback()
-
-    # Final commit for any remaining rows
-    conn.commit()
+    # Only the normalized columns need work per row; all other values pass through unchanged.
+    # If no column was dropped, the CSV row list itself becomes the parameter sequence.
+    kept_indexes = [index for index, _ in plan]
+    all_columns_kept = len(kept_indexes) == len(col_index)
+    normalized_positions = [(position, ids) for position, (_, ids) in enumerate(plan) if ids is not None]
+
+    def generate_rows():
+        """Yields fully normalized value lists, skipping invalid rows."""
+        nonlocal skipped_count, rows_read
+        for i, row in enumerate(reader):
+            current_row_num = i + 1 # 1-based index for progress reporting
+            rows_read = current_row_num
+
+            if len(row) != len(col_index):
+                print(f"Warning: Skipping row {current_row_num+1} due to incorrect number of columns (expected {len(col_index)}, got {len(row)}).")
+                skipped_count += 1
+                continue
+            if tg_code_index is not None and not row[tg_code_index]:
+                print(f"Error processing row {current_row_num+1}: TG-Code is empty in row {current_row_num+1}. Skipping.")
+                skipped_count += 1
+                continue
+
+            values = row if all_columns_kept else [row[index] for index in kept_indexes]
+            try:
+                for position, ids in normalized_positions:
+                    values[position] = ids[values[position] or '(leer)']
+            except KeyError as e:
+                print(f"Unexpected error processing row {current_row_num+1}: missing normalized value {e}. Skipping.")
+                skipped_count += 1
+                continue
+            yield values
+
+    rows = generate_rows()
+    rows_since_commit = 0
+    last_progress = time.monotonic()
+
+    cursor.execute("BEGIN")
+    while True:
+        batch = list(islice(rows, config.IMPORT_BATCH_SIZE))
+        if not batch: break
+
+        failed_count = _flush_batch(cursor, insert_sql, batch)
+        inserted_count += len(batch) - failed_count
+        skipped_count += failed_count
+        rows_since_commit += len(batch)
+
+        # Commit periodically
+        if rows_since_commit >= config.IMPORT_COMMIT_INTERVAL:
+            cursor.execute("COMMIT")
+            cursor.execute("BEGIN")
+            rows_since_commit = 0
+
+        # Report progress per batch, at most once per interval, so the callback cost does not scale with row count
+        now = time.monotonic()
+        if progress_callback and now - last_progress >= config.IMPORT_PROGRESS_INTERVAL:
+            progress_callback(current_row=rows_read, total_rows=total_rows)
+            last_progress = now
+    cursor.execute("COMMIT")
 
     # Final progress update
     if progress_callback:
@@ -230,53 +290,196 @@ def insert_data(conn, reader, header_map, normalized_table_mapping, total_rows,
         print(f"Skipped {skipped_count} rows due to errors.")
 
 # --- Data Querying ---
+FLAT_TABLE = "Emissionen_flat" # Denormalized copy of Emissionen with all normalized names resolved
+
+def _build_joined_select(plain_columns=None, normalized_columns=None):
+    """
+    Builds the SELECT (without WHERE clause) that joins Emissionen with the normalized tables.
+    plain_columns limits the columns taken from Emissionen itself (default: all of them),
+    normalized_columns the normalized columns that get a JOIN (default: all of them).
+    """
+    if plain_columns is None:
+        select_parts = ["e.*"] # Select all columns from the main table first
+    else:
+        select_parts = [f'e."{col}"' for col in plain_columns]
+    join_parts = []
+
+    for i, original_col in enumerate(config.NORMALIZE_COLUMNS):
+        if normalized_columns is not None and original_col not in normalized_columns: continue # Not needed, skip the JOIN
+        clean_base = clean_sql_identifier(original_col)
+        if not clean_base: continue
+        table_name = create_normalized_table_name(clean_base)
+        if not table_name: continue
+
+        id_col_in_emissionen = f"{clean_base}_id"
+        table_alias = f"t{i}"
+        # Select the 'name' from the normalized table, aliasing it back to the original column name
+        # Use quotes around the alias if the original name needs them
+        select_parts.append(f'{table_alias}.name AS "{original_col}"')
+        join_parts.append(
+            f'LEFT JOIN {table_name} {table_alias} ON e."{id_col_in_emissionen}" = {table_alias}.id'
+        )
+
+    return f"""
+        SELECT {', '.join(select_parts)}
+        FROM Emissionen e
+        {' '.join(join_parts)}
+    """
+
+_JOINED_SELECT = _build_joined_select() # NORMALIZE_COLUMNS is constant, so the JOINs are built once
+
+def create_flat_table(cursor):
+    """(Re)creates the denormalized search table from Emissionen and the normalized tables."""
+    print(f"Creating search table {FLAT_TABLE}...")
+    cursor.execute(f"DROP TABLE IF EXISTS {FLAT_TABLE};")
+    cursor.execute(f"CREATE TABLE {FLAT_TABLE} AS {_JOINED_SELECT};")
+    tg_code_col = clean_sql_identifier('TG-Code')
+    cursor.execute(f'CREATE UNIQUE INDEX idx_{FLAT_TABLE}_TG_Code ON {FLAT_TABLE} ("{tg_code_col}");')
+
+_TG_CODE_COL = clean_sql_identifier("TG-Code")
+# Columns rendered by the GUI, CLI and PDF export; searches fetch only these
+_DISPLAY_COLUMNS = tuple(
+    col for col in config.DISPLAY_ORDER_WITH_DIVIDERS
+    if col != config.DIVIDER_MARKER and clean_sql_identifier(col) not in config.OMIT_COLUMNS_CLEANED
+)
+SEARCH_CACHE_SIZE = 1024 # TG-Codes whose search result is kept in memory
+SEARCH_BATCH_SIZE = 900 # Codes per IN (...) query; stays below SQLite's default limit of 999 parameters
+_search_conn = None # Read-only connection reused across searches
+_search_select = None # "SELECT ... WHERE <TG-Code column>" for the open search connection (flat table or JOIN fallback)
+_search_query = None # Single-code search built from _search_select
+_search_data_version = None # PRAGMA data_version the cached search results belong to
+
+def _get_search_connection():
+    """Returns the cached read-only search connection, opening it on first use."""
+    global _search_conn
+    if _search_conn is None:
+        db_uri = f"{pathlib.Path(config.DATABASE_PATH).resolve().as_uri()}?mode=ro"
+        _search_conn = sqlite3.connect(db_uri, uri=True, check_same_thread=False)
+        _search_conn.row_factory = sqlite3.Row # Return rows as dictionary-like objects
+        # The file is already in WAL mode from the import; journal_mode/synchronous cannot be set on a read-only handle
+        # mmap serves pages straight from the OS page cache; temp tables and a 64 MB page cache stay in memory
+        _search_conn.executescript("""
+            PRAGMA query_only = ON;
+            PRAGMA mmap_size = 268435456;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -64000;
+        """)
+    return _search_conn
+
+def close_search_connection():
+    """Closes the cached search connection (e.g., before the database is rebuilt)."""
+    global _search_conn, _search_select, _search_query, _search_data_version
+    if _search_conn is not None:
+        _search_conn.close()
+        _search_conn = None
+    _search_select = None
+    _search_query = None
+    _search_data_version = None
+    _search_row.cache_clear() # Cached rows belong to the database that was open
+
+atexit.register(close_search_connection) # Once per process; a no-op if no search connection is open
+
+def _bootstrap_flat_table():
+    """Creates the search table in a database imported before it existed. Returns True on success."""
+    print(f"Search table {FLAT_TABLE} missing, building it from the existing data...")
+    try:
+        # importer.check_for_updates() takes the file's mtime as the time of the last import; keep it
+        db_stat = os.stat(config.DATABASE_PATH)
+        conn = get_db_connection()
+    except (OSError, sqlite3.Error):
+        return False
+    try:
+        with conn:
+            cursor = conn.cursor()
+            create_flat_table(cursor)
+            cursor.execute(f"ANALYZE {FLAT_TABLE};") # Planner statistics for the new table
+        # Move the new table from the WAL into the database file now, so the restored times below stick
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        return True
+    except sqlite3.Error as e:
+        print(f"Could not create search table {FLAT_TABLE}: {e}")
+        return False
+    finally:
+        conn.close()
+        try:
+            os.utime(config.DATABASE_PATH, ns=(db_stat.st_atime_ns, db_stat.st_mtime_ns))
+        except OSError as e:
+            print(f"Warning: Could not restore the modification time of '{config.DATABASE_PATH}': {e}")
+
+def _table_columns(cursor, table):
+    """Returns the column names of a table (empty if it does not exist)."""
+    cursor.execute(f'PRAGMA table_info("{table}")')
+    return {row["name"] for row in cursor.fetchall()}
+
+def _resolve_search_select(cursor):
+    """
+    Returns the search SELECT for the current database up to the TG-Code column of its WHERE clause,
+    building the search table once if needed. Only displayed columns that exist in this database are selected.
+    """
+    flat_columns = _table_columns(cursor, FLAT_TABLE)
+    if not flat_columns and _bootstrap_flat_table():
+        flat_columns = _table_columns(cursor, FLAT_TABLE)
+    if flat_columns:
+        select_list = ", ".join(f'"{col}"' for col in _DISPLAY_COLUMNS if col in flat_columns)
+        return f'SELECT {select_list} FROM {FLAT_TABLE} WHERE "{_TG_CODE_COL}"'
+    # Search table could not be written (e.g., read-only location): resolve the names with JOINs
+    base_columns = _table_columns(cursor, "Emissionen")
+    plain_columns = [col for col in _DISPLAY_COLUMNS if col in base_columns]
+    return f'{_build_joined_select(plain_columns, _DISPLAY_COLUMNS)} WHERE e."{_TG_CODE_COL}"'
+
+def _prepare_search(cursor):
+    """Resolves the search queries once per search connection."""
+    global _search_select, _search_query
+    if _search_select is None:
+        _search_select = _resolve_search_select(cursor)
+        _search_query = f"{_search_select} = ?"
+
+def _check_data_version(cursor):
+    """
+    Drops the cached search results and queries if another connection (e.g., an import run from the
+    command line) changed the database since the last search.
+    """
+    global _search_select, _search_query, _search_data_version
+    data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+    if data_version == _search_data_version:
+        return
+    if _search_data_version is not None:
+        _search_select = None # The tables may have been rebuilt as well
+        _search_query = None
+        _search_row.cache_clear()
+    _search_data_version = data_version
+
+def explain_search_query():
+    """Prints SQLite's query plan for the TG-Code search (debug aid; should show SEARCH ... USING INDEX)."""
+    cursor = _get_search_connection().cursor()
+    _prepare_search(cursor)
+    for row in cursor.execute(f"EXPLAIN QUERY PLAN {_search_query}", ("",)):
+        print(f"QUERY PLAN: {row['detail']}")
+
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _search_row(tg_code_to_search):
+    """
+    Runs the search for one TG-Code; results (including misses) are cached until the connection is closed
+    or the database is changed (see _check_data_version).
+    """
+    cursor = _get_search_connection().cursor()
+    _prepare_search(cursor)
+    # print(f"DEBUG Search Query: {_search_query}") # Optional debug
+
+    cursor.execute(_search_query, (tg_code_to_search,))
+    result = cursor.fetchone() # fetchone returns a Row object or None
+    return dict(result) if result else None # Plain dict, so the cached value does not hold on to the cursor
+
 def search_by_tg_code(tg_code_to_search):
-    """Searches the database for a TG-Code and returns the raw data row."""
+    """Searches the database for a TG-Code and returns the raw data (dict of column -> value) or None."""
     if not os.path.exists(config.DATABASE_PATH):
         print(f"Error: Database file '{config.DATABASE_PATH}' not found.")
         return None # Return None if DB doesn't exist
 
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Dynamically build the SELECT query with JOINs for normalized columns
-        select_parts = ["e.*"] # Select all columns from the main table first
-        join_parts = []
-        normalized_mapping_for_query = {} # To reconstruct normalized values if needed
-
-        # Re-create the mapping needed for the query (similar to schema creation)
-        for i, original_col in enumerate(config.NORMALIZE_COLUMNS):
-            clean_base = clean_sql_identifier(original_col)
-            if not clean_base: continue
-            table_name = create_normalized_table_name(clean_base)
-            if not table_name: continue
-
-            id_col_in_emissionen = f"{clean_base}_id"
-            table_alias = f"t{i}"
-            # Select the 'name' from the normalized table, aliasing it back to the original column name
-            # Use quotes around the alias if the original name needs them
-            name_alias = original_col
-            select_parts.append(f'{table_alias}.name AS "{name_alias}"')
-            join_parts.append(
-                f'LEFT JOIN {table_name} {table_alias} ON e."{id_col_in_emissionen}" = {table_alias}.id'
-            )
-            normalized_mapping_for_query[original_col] = (table_name, id_col_in_emissionen, name_alias)
-
-        # Construct the full query
-        query = f"""
-            SELECT {', '.join(select_parts)}
-            FROM Emissionen e
-            {' '.join(join_parts)}
-            WHERE e."{clean_sql_identifier('TG-Code')}" = ?
-        """
-        # print(f"DEBUG Search Query: {query}") # Optional debug
-
-        cursor.execute(query, (tg_code_to_search,))
-        result = cursor.fetchone() # fetchone returns a Row object or None
-
-        return result if result else None # Return the Row object directly or None
+        _check_data_version(_get_search_connection().cursor())
+        result = _search_row(tg_code_to_search)
+        return dict(result) if result else None # Copy, so callers cannot modify the cached entry
 
     except sqlite3.Error as e:
         print(f"Database error during search for '{tg_code_to_search}': {e}")
@@ -284,7 +487,36 @@ def search_by_tg_code(tg_code_to_search):
     except Exception as e:
         print(f"An unexpected error occurred during search: {e}")
         return None # Return None on error
-    finally:
-        if conn:
-            conn.close()
 
+def search_by_tg_codes(tg_codes):
+    """
+    Searches the database for several TG-Codes at once.
+    Returns a dict {TG-Code: raw data} containing only the codes that were found.
+    """
+    if not os.path.exists(config.DATABASE_PATH):
+        print(f"Error: Database file '{config.DATABASE_PATH}' not found.")
+        return {} # Return an empty result if DB doesn't exist
+
+    unique_codes = list(dict.fromkeys(tg_codes)) # Drop duplicates, keep order
+    results = {}
+    try:
+        cursor = _get_search_connection().cursor()
+        _check_data_version(cursor)
+        _prepare_search(cursor)
+
+        # One IN (...) query per chunk instead of one query per code
+        for start in range(0, len(unique_codes), SEARCH_BATCH_SIZE):
+            chunk = unique_codes[start:start + SEARCH_BATCH_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(f"{_search_select} IN ({placeholders})", chunk)
+            for row in cursor.fetchall():
+                results[row[_TG_CODE_COL]] = dict(row)
+
+        return results
+
+    except sqlite3.Error as e:
+        print(f"Database error during search for {len(unique_codes)} TG-Codes: {e}")
+        return {} # Return an empty result on error
+    except Exception as e:
+        print(f"An unexpected error occurred during search: {e}")
+        return {} # Return an empty result on error
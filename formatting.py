@@ -1,93 +1,130 @@
 # formatting.py
-from datetime import datetime
+from functools import lru_cache
 import config
 from utils import clean_sql_identifier
 import translation # Import the new translation module
 
-def format_vehicle_data(result_row):
-    """
-    Takes a raw database row (sqlite3.Row or dict) and returns a dictionary
-    with values formatted for display (strings).
-    Applies date formatting, unit suffixes, PS calculation, and translations.
-    """
-    if not result_row:
-        return {}
+# ID columns of normalized values (e.g., Marke_id); skipped in favour of the joined names
+_NORMALIZED_ID_COLUMNS = frozenset(f"{clean_sql_identifier(c)}_id" for c in config.NORMALIZE_COLUMNS)
 
-    formatted_data = {}
-    available_columns = result_row.keys() # Get column names from the Row object
+# --- Per-column formatters (raw value -> display string) ---
+def _format_text(value):
+    """Default formatting: '(leer)' placeholder translated, None as empty string, everything else as str."""
+    # Handle '(leer)' placeholder (often comes from normalized tables)
+    if value == '(leer)':
+        return translation._("(leer)") # Translate the placeholder
+    if value is None:
+        return ""
+    return str(value) # Convert to string for consistent handling
 
-    # Iterate through all available columns in the result row
-    for original_col_name in available_columns:
-        # Skip the normalized ID columns (e.g., Marke_id)
-        if original_col_name.endswith("_id") and original_col_name[:-3] in [clean_sql_identifier(c) for c in config.NORMALIZE_COLUMNS]:
-             continue
+def _format_date(value):
+    """Homologationsdatum: stored as YYYYMMDD, displayed as DD.MM.YYYY."""
+    if not value:
+        return ""
+    # Rearranging the digits avoids a datetime round-trip
+    date_str = str(value)
+    if len(date_str) == 8 and date_str.isdigit():
+        return f"{date_str[6:8]}.{date_str[4:6]}.{date_str[0:4]}"
+    return f"{value} (format?)" # Fallback if the value is not a date
 
-        cleaned_col_name = clean_sql_identifier(original_col_name)
+# Translation keys of the coded values; looked up at format time since the language can change
+_ANTRIEB_KEYS = {code: f"antrieb_{code}" for code in ('V', 'H', 'A')}
+_TREIBSTOFF_KEYS = {code: f"treibstoff_{code}" for code in ('D', 'B', 'E')}
 
-        # Skip columns marked for omission
-        if cleaned_col_name in config.OMIT_COLUMNS_CLEANED:
-            continue
+def _format_antrieb(value):
+    """Antrieb: codes V/H/A are translated, e.g. via the key "antrieb_V"."""
+    display_value = _format_text(value)
+    translation_key = _ANTRIEB_KEYS.get(display_value)
+    return translation._(translation_key) if translation_key else display_value
 
-        value = result_row[original_col_name] # Access value using the original name from the Row object
+def _format_treibstoff(value):
+    """Treibstoff: codes D/B/E are translated, e.g. via the key "treibstoff_D"."""
+    display_value = _format_text(value)
+    translation_key = _TREIBSTOFF_KEYS.get(display_value)
+    return translation._(translation_key) if translation_key else display_value
 
-        # --- Process and format the value ---
-        display_value = "" # Default to empty string
-        is_leistung = (cleaned_col_name == 'Leistung')
-        is_antrieb = (cleaned_col_name == 'Antrieb')
-        is_treibstoff = (cleaned_col_name == 'Treibstoff')
+def _format_leistung(value):
+    """Leistung: kW value with the calculated PS."""
+    display_value = _format_text(value)
+    if not display_value:
+        return display_value
+    try:
+        # Just the raw number when coming directly from the DB
+        kw_str = display_value.split(' ')[0]
+        ps_value = float(kw_str) * config.KW_TO_PS
+        return f"{kw_str} kW / {ps_value:.1f} PS" # Combine kW and PS
+    except (ValueError, TypeError):
+        # If conversion fails, just add kW unit if possible
+        return f"{display_value} kW (Invalid)"
 
-        # 1. Handle Special Formatting (Date)
-        if cleaned_col_name == 'Homologationsdatum':
-            if value:
-                try:
-                    # Input format might be YYYYMMDD as string from DB
-                    date_obj = datetime.strptime(str(value), config.HOMOLOGATIONSDATUM_INPUT_FORMAT)
-                    display_value = date_obj.strftime(config.HOMOLOGATIONSDATUM_OUTPUT_FORMAT)
-                except (ValueError, TypeError):
-                    display_value = f"{value} (format?)" # Fallback if parsing fails
+def _unit_formatter(unit):
+    """Returns a formatter that appends the unit to non-empty values."""
+    def format_with_unit(value):
+        display_value = _format_text(value)
+        return f"{display_value} {unit}" if display_value else display_value
+    return format_with_unit
 
-        # 2. Handle '(leer)' placeholder (often comes from normalized tables)
-        elif isinstance(value, str) and value == '(leer)':
-            # Use translation for the placeholder itself
-            display_value = translation._("(leer)") # Translate the placeholder
+# Dispatch table keyed by cleaned column name; columns without an entry use _format_text
+_FORMATTERS = {col: _unit_formatter(unit) for col, unit in config.UNITS_MAP.items()}
+_FORMATTERS.update({
+    'Homologationsdatum': _format_date,
+    'Leistung': _format_leistung, # Replaces the plain kW unit formatter
+    'Antrieb': _format_antrieb,
+    'Treibstoff': _format_treibstoff,
+})
 
-        # 3. Handle other non-None values (initial assignment)
-        elif value is not None:
-             display_value = str(value) # Convert to string for consistent handling
+@lru_cache(maxsize=None)
+def _formatter_for(col_name):
+    """Returns the formatter of a column, or None if the column is not displayed (ID or omitted columns)."""
+    # Skip the normalized ID columns (e.g., Marke_id)
+    if col_name in _NORMALIZED_ID_COLUMNS:
+        return None
+    cleaned_col_name = clean_sql_identifier(col_name)
+    # Skip columns marked for omission
+    if cleaned_col_name in config.OMIT_COLUMNS_CLEANED:
+        return None
+    return _FORMATTERS.get(cleaned_col_name, _format_text)
 
-        # --- 4. Apply Translations (Antrieb, Treibstoff) using translation module ---
-        # This happens *after* getting the raw value but *before* adding units/PS
-        if is_antrieb and display_value in ['V', 'H', 'A']: # Check for valid keys
-            # Construct the translation key, e.g., "antrieb_V"
-            translation_key = f"antrieb_{display_value}"
-            display_value = translation._(translation_key)
-        elif is_treibstoff and display_value in ['D', 'B', 'E']: # Check for valid keys
-            # Construct the translation key, e.g., "treibstoff_D"
-            translation_key = f"treibstoff_{display_value}"
-            display_value = translation._(translation_key)
+@lru_cache(maxsize=None)
+def _column_plan(columns):
+    """
+    Returns (original name, formatter) for every displayable column of a result schema.
+    Every search returns the same columns, so this runs once instead of once per row.
+    """
+    plan = []
+    for original_col_name in columns:
+        formatter = _formatter_for(original_col_name)
+        if formatter is not None:
+            plan.append((original_col_name, formatter))
+    return tuple(plan)
 
-        # --- 5. Add Units / Calculate PS ---
-        # Special handling for Leistung (kW and PS)
-        if is_leistung and display_value:
-            try:
-                # Extract numeric part, assuming it might have " kW / ... PS" already if formatted elsewhere (unlikely now)
-                # Or just the raw number if coming directly from DB
-                kw_str = display_value.split(' ')[0]
-                kw_value_float = float(kw_str)
-                ps_value = kw_value_float * config.KW_TO_PS
-                ps_value_formatted = f"{ps_value:.1f}"
-                # Use translation keys for "kW" and "PS" if desired, or keep simple
-                display_value = f"{kw_str} kW / {ps_value_formatted} PS" # Combine kW and PS
-            except (ValueError, TypeError):
-                # If conversion fails, just add kW unit if possible
-                display_value = f"{display_value} kW (Invalid)"
+def format_vehicle_data(result_row):
+    """
+    Takes a raw database row (sqlite3.Row or dict) and returns a dictionary
+    with values formatted for display (strings).
+    Applies date formatting, unit suffixes, PS calculation, and translations.
+    """
+    if not result_row:
+        return {}
 
-        # Add units for other columns (if value exists, unit is defined, and not Leistung)
-        elif display_value and cleaned_col_name in config.UNITS_MAP and not is_leistung:
-            display_value = f"{display_value} {config.UNITS_MAP[cleaned_col_name]}"
+    available_columns = tuple(result_row.keys()) # Get column names from the Row object
 
-        # Store the final formatted string in the dictionary
-        # Use the original column name as the key for consistency with DISPLAY_ORDER
-        formatted_data[original_col_name] = display_value
+    # Use the original column name as the key for consistency with DISPLAY_ORDER
+    return {
+        original_col_name: formatter(result_row[original_col_name])
+        for original_col_name, formatter in _column_plan(available_columns)
+    }
 
-    return formatted_data
+def format_column(result_row, col_name, default=""):
+    """
+    Formats a single column of a raw database row for display, with the same rules as format_vehicle_data().
+    Returns default if the row has no such column or the column is omitted from display.
+    """
+    formatter = _formatter_for(col_name) # Resolved once per column name, not per row
+    if formatter is None:
+        return default
+    try:
+        value = result_row[col_name]
+    except (KeyError, IndexError): # dict / sqlite3.Row without this column
+        return default
+    return formatter(value)
@@ -643,9 +643,8 @@ class VehicleDataApp:
         valid_codes_found = []
         found_data = False
         try:
-            for tg_code in tg_codes_input:
-                self._update_status("status_compare_fetching", code=tg_code)
-                formatted_data = compare.get_formatted_car_data_for_compare(tg_code)
+            self._update_status("status_compare_fetching", code=codes_str)
+            for tg_code, formatted_data in zip(tg_codes_input, compare.get_formatted_cars_data_for_compare(tg_codes_input)):
                 all_formatted_data.append(formatted_data)
                 valid_codes_found.append(tg_code)
                 if formatted_data: found_data = True
@@ -689,10 +688,16 @@ class VehicleDataApp:
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    # Initialize translations FIRST
-    translation.initialize_translations()
-
+    # Detect the system language while Tk starts up
+    translation.start_language_detection()
     root = tk.Tk()
+
+    # Initialize translations FIRST, so the UI and the startup dialogs are built in the detected language.
+    # Should the detection take longer than the timeout, the UI starts in the default language and switches later.
+    translation.initialize_translations(
+        detection_timeout=config.LANG_DETECTION_TIMEOUT,
+        on_language_detected=lambda lang_code: root.after(0, lambda: app.change_language(lang_code))
+    )
     app = VehicleDataApp(root) # Creates UI, initially disabled
 
     # Perform startup check *before* starting the main loop
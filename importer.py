@@ -5,13 +5,13 @@ import sys
 import requests
 import codecs
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from email.utils import parsedate_to_datetime
+from email.utils import formatdate, parsedate_to_datetime
 
 # Import refactored components
 import config
 import database
-from utils import get_resource_path
 
 # --- Constants for Check Status ---
 CHECK_UP_TO_DATE = 'UP_TO_DATE'
@@ -20,11 +20,37 @@ CHECK_DB_MISSING = 'DB_MISSING'
 CHECK_TIMEOUT = 'TIMEOUT'
 CHECK_ERROR = 'ERROR'
 
+# --- ETag Sidecar Files ---
+def _etag_path(path):
+    """Returns the path of the sidecar file storing the ETag belonging to 'path'."""
+    return f"{path}.etag"
+
+def _read_etag(path):
+    """Returns the stored ETag for 'path', or None if there is none."""
+    try:
+        with open(_etag_path(path), 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def _write_etag(path, etag):
+    """Stores the ETag for 'path' (removes a stale one if etag is None)."""
+    try:
+        if etag:
+            with open(_etag_path(path), 'w', encoding='utf-8') as f:
+                f.write(etag)
+        elif os.path.exists(_etag_path(path)):
+            os.remove(_etag_path(path))
+    except OSError as e:
+        print(f"Warning: Could not write ETag file for '{path}': {e}")
+
+
 # --- Modified Check Function (No Download) ---
 def check_for_updates(url, db_path):
     """
-    Checks if a database update is available by comparing the DB modification time
-    with the remote source file's time. Does NOT download.
+    Checks if a database update is available with a conditional HEAD request
+    (If-Modified-Since the DB modification time, If-None-Match the ETag of the last import),
+    falling back to comparing the remote 'Last-Modified' header. Does NOT download.
     Returns a status string: CHECK_UP_TO_DATE, CHECK_UPDATE_AVAILABLE, CHECK_DB_MISSING, CHECK_TIMEOUT, CHECK_ERROR.
     """
     print("-" * 40)
@@ -48,9 +74,20 @@ def check_for_updates(url, db_path):
     # 2. Check remote file modification time
     try:
         print("Checking remote source file modification date...")
-        response = requests.head(url, timeout=config.STARTUP_CHECK_TIMEOUT)
+        request_headers = {'If-Modified-Since': formatdate(db_timestamp, usegmt=True)}
+        stored_etag = _read_etag(db_path)
+        if stored_etag:
+            request_headers['If-None-Match'] = stored_etag
+        response = requests.head(url, headers=request_headers, timeout=config.STARTUP_CHECK_TIMEOUT)
         response.raise_for_status()
 
+        if response.status_code == 304:
+            print("Remote source file not modified since the last import.")
+            return CHECK_UP_TO_DATE
+        if stored_etag and response.headers.get('ETag') == stored_etag:
+            print("Remote source file ETag matches the last import.")
+            return CHECK_UP_TO_DATE
+
         if 'Last-Modified' in response.headers:
             remote_last_modified_str = response.headers['Last-Modified']
             remote_mtime_aware = parsedate_to_datetime(remote_last_modified_str)
@@ -86,9 +123,64 @@ def check_for_updates(url, db_path):
 
 
 # --- New Download Function ---
+def _download_parallel(url, download_target_path):
+    """
+    Downloads the file in config.DOWNLOAD_PARTS parallel HTTP range requests into a preallocated file.
+    Returns True on success, False if the server does not support ranges or a part failed.
+    """
+    try:
+        head = requests.head(url, headers={'Accept-Encoding': 'identity'}, timeout=config.STARTUP_CHECK_TIMEOUT)
+        head.raise_for_status()
+        total_size = int(head.headers.get('Content-Length', 0))
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Could not determine download size ({e}). Using single download.")
+        return False
+
+    if config.DOWNLOAD_PARTS < 2 or total_size < config.DOWNLOAD_PARALLEL_MIN_SIZE \
+            or head.headers.get('Accept-Ranges') != 'bytes':
+        return False
+
+    etag = head.headers.get('ETag')
+    part_size = -(-total_size // config.DOWNLOAD_PARTS) # Ceiling division
+    byte_ranges = [(start, min(start + part_size, total_size) - 1) for start in range(0, total_size, part_size)]
+
+    def download_part(byte_range):
+        start, end = byte_range
+        headers = {'Range': f"bytes={start}-{end}", 'Accept-Encoding': 'identity'}
+        if etag:
+            headers['If-Range'] = etag # Server answers 200 (not 206) if the file changed meanwhile
+        with requests.get(url, headers=headers, stream=True, timeout=config.DOWNLOAD_TIMEOUT) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise IOError(f"server ignored range request (status {r.status_code})")
+            with open(download_target_path, 'r+b') as f:
+                f.seek(start)
+                for chunk in r.iter_content(chunk_size=config.DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                if f.tell() != end + 1:
+                    raise IOError(f"incomplete download of bytes {start}-{end}")
+
+    print(f"Downloading {total_size} bytes in {len(byte_ranges)} parallel parts...")
+    try:
+        with open(download_target_path, 'wb') as f:
+            f.truncate(total_size)
+        with ThreadPoolExecutor(max_workers=len(byte_ranges)) as executor:
+            list(executor.map(download_part, byte_ranges))
+    except (requests.exceptions.RequestException, IOError) as e:
+        print(f"Parallel download failed ({e}). Falling back to single download.")
+        try:
+            os.remove(download_target_path) # Don't leave the preallocated, partly zero-filled file behind
+        except OSError:
+            pass
+        return False
+
+    _write_etag(download_target_path, etag)
+    return True
+
 def download_source_file(url, download_target_path):
     """
     Downloads the source file from the URL to the target path.
+    The response ETag is kept next to the file until the import succeeds.
     Returns True on success, False on failure.
     """
     print(f"Attempting to download source file to '{download_target_path}'...")
@@ -102,11 +194,17 @@ def download_source_file(url, download_target_path):
                 print(f"Error creating directory '{download_dir}': {e}")
                 return False # Cannot proceed without directory
 
+        if _download_parallel(url, download_target_path):
+            print("Download complete.")
+            return True
+
         with requests.get(url, stream=True, timeout=config.DOWNLOAD_TIMEOUT) as r:
             r.raise_for_status()
             with open(download_target_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
+                # iter_content() maps urllib3 errors to requests exceptions (r.raw would not)
+                for chunk in r.iter_content(chunk_size=config.DOWNLOAD_CHUNK_SIZE):
                     f.write(chunk)
+            _write_etag(download_target_path, r.headers.get('ETag'))
         print("Download complete.")
         return True
 
@@ -145,33 +243,42 @@ def main(progress_callback=None):
     try:
         print(f"Proceeding with import from '{config.INPUT_FILE_PATH}' to '{config.DATABASE_PATH}'...")
 
-        # Count total rows
-        total_rows = 0
-        print("Counting total rows in input file...")
-        try:
+        def data_rows():
+            """Streams the CSV rows of the source file from disk, skipping the header (constant memory per pass)."""
             with codecs.open(config.INPUT_FILE_PATH, 'r', encoding=config.FILE_ENCODING, errors='replace') as infile:
                 reader = csv.reader(infile, delimiter=config.DELIMITER)
-                header = next(reader)
-                total_rows = sum(1 for row in reader)
-            print(f"Found {total_rows} data rows.")
-        except Exception as e:
-            print(f"Warning: Could not accurately count rows: {e}.")
-            total_rows = 0
-
-        # Connect to DB
-        conn = database.get_db_connection()
+                next(reader, None)
+                yield from reader
+
+        # Estimate total rows from the line count (only used for progress reporting);
+        # counted on the raw bytes, the single-byte encoding has no other '\n' byte
+        line_breaks = 0
+        last_chunk = b''
+        with open(config.INPUT_FILE_PATH, 'rb') as infile:
+            for chunk in iter(lambda: infile.read(1024 * 1024), b''):
+                line_breaks += chunk.count(b'\n')
+                last_chunk = chunk
+        total_rows = line_breaks - (1 if last_chunk.endswith(b'\n') else 0)
+        print(f"Found {total_rows} data rows.")
+
+        # Connect to DB (the cached search connection must not outlive the old tables)
+        database.close_search_connection()
+        conn = database.get_import_connection()
         cursor = conn.cursor()
         print("Database connection established.")
 
         # Create Schema
         header_map, normalized_table_mapping = database.create_schema(cursor)
 
+        # Populate Normalized Tables
+        print("Collecting normalized values...")
+        normalized_ids = database.populate_normalized_tables(cursor, data_rows(), header_map, normalized_table_mapping)
+
         # Insert Data
         print("Starting data insertion...")
-        with codecs.open(config.INPUT_FILE_PATH, 'r', encoding=config.FILE_ENCODING, errors='replace') as infile:
-            reader = csv.reader(infile, delimiter=config.DELIMITER)
-            next(reader)
-            database.insert_data(conn, reader, header_map, normalized_table_mapping, total_rows, progress_callback)
+        database.insert_data(conn, data_rows(), header_map, normalized_table_mapping, normalized_ids, total_rows, progress_callback)
+        database.create_flat_table(cursor)
+        database.create_indexes(cursor, normalized_table_mapping)
 
         print("Import process finished successfully.")
         import_successful = True
@@ -192,6 +299,9 @@ def main(progress_callback=None):
 
         # Delete source file ONLY on successful import
         if import_successful:
+            # The database now reflects the downloaded file, so its ETag belongs to the database
+            _write_etag(config.DATABASE_PATH, _read_etag(config.INPUT_FILE_PATH))
+            _write_etag(config.INPUT_FILE_PATH, None)
             try:
                 if os.path.exists(config.INPUT_FILE_PATH):
                     print(f"Attempting to delete source file: {config.INPUT_FILE_PATH}")
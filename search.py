@@ -6,40 +6,50 @@ import os
 import config
 import database
 import formatting
-from utils import clean_sql_identifier # Needed for checking header keys
 
-def display_formatted_data_cli(formatted_data):
-    """Prints formatted data to the console based on DISPLAY_ORDER."""
-    if not formatted_data:
+# Padded "label: " prefixes of the body lines, built once
+_LABEL_PREFIX = {
+    item_name: f"{item_name:<25}: "
+    for item_name in config.DISPLAY_ORDER_WITH_DIVIDERS if item_name != config.DIVIDER_MARKER
+}
+
+def display_vehicle_data_cli(raw_data_row):
+    """
+    Formats and prints a raw search result to the console based on DISPLAY_ORDER.
+    Formats only the displayed columns, in the same pass that prints them (no intermediate dict).
+    """
+    if not raw_data_row:
         print("No data to display.")
         return
 
-    print("-" * 40)
+    # Collect all lines and write them at once instead of one print() per line
+    lines = ["-" * 40]
     # --- Header ---
     # Safely get header values using original names
-    tg_code_val = formatted_data.get('TG_Code', 'N/A')
-    marke_val = formatted_data.get('Marke', 'N/A')
-    typ_val = formatted_data.get('Typ', 'N/A')
-    print(f"Details for TG-Code: {tg_code_val} - {marke_val} - {typ_val}")
-    print("-" * 40)
+    tg_code_val = formatting.format_column(raw_data_row, 'TG_Code', 'N/A')
+    marke_val = formatting.format_column(raw_data_row, 'Marke', 'N/A')
+    typ_val = formatting.format_column(raw_data_row, 'Typ', 'N/A')
+    lines.append(f"Details for TG-Code: {tg_code_val} - {marke_val} - {typ_val}")
+    lines.append("-" * 40)
 
     # --- Body ---
     for item_name in config.DISPLAY_ORDER_WITH_DIVIDERS:
         if item_name == config.DIVIDER_MARKER:
-            print(config.DIVIDER_MARKER)
+            lines.append(config.DIVIDER_MARKER)
             continue
 
-        # Skip header items already printed
+        # Skip header items already listed
         if item_name in ['TG_Code', 'Marke', 'Typ']:
             continue
 
-        # Get the formatted value using the original item name as the key
-        display_value = formatted_data.get(item_name, "") # Default to empty string if somehow missing
+        # Format the value using the original item name as the key
+        display_value = formatting.format_column(raw_data_row, item_name) # Empty string if somehow missing
 
-        # Print label (original name) and formatted value
-        print(f"{item_name:<25}: {display_value}")
+        # Label (original name) and formatted value
+        lines.append(_LABEL_PREFIX[item_name] + display_value)
 
-    print("-" * 40)
+    lines.append("-" * 40)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # --- Main Execution (CLI) ---
@@ -57,10 +67,8 @@ if __name__ == "__main__":
 
     if raw_data_row:
         print("Data found. Formatting...")
-        # 2. Format the raw data for display
-        formatted_vehicle_data = formatting.format_vehicle_data(raw_data_row)
-        # 3. Display the formatted data
-        display_formatted_data_cli(formatted_vehicle_data)
+        # 2. Format and display the data in one pass
+        display_vehicle_data_cli(raw_data_row)
     else:
         print(f"No data found for TG-Code '{tg_code_input}'.")
 
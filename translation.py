@@ -2,50 +2,149 @@
 import os
 import sys
 import json
+import marshal
+import pickle
 import locale # <--- Import the locale module
+import logging
+import threading
 
 # Import necessary components from other refactored modules
 import config
 from utils import get_resource_path
 
+try:
+    import orjson # Optional, faster JSON parser; its JSONDecodeError subclasses json.JSONDecodeError
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+log = logging.getLogger(__name__) # Messages are only formatted if the level is enabled
+
 # --- Module-level variables ---
 translations = {}
+_key_lengths = frozenset() # Lengths of the keys in translations; a key of any other length cannot be in it
+_msg_cache = {} # Resolved messages (including "[key]" fallbacks) of calls without placeholders; cleared on load
+_fmt_cache = {} # Resolved templates of calls with placeholders; cleared on load
+_lang_cache = {} # Language code -> translations already loaded in this session
+_bundle_checked = False # Whether the prebuilt locales bundle was looked for yet
+_detection = None # (thread, result) of a language detection started by start_language_detection()
 # current_language will be set by initialize_translations now
 current_language = config.DEFAULT_LANG # Keep a default fallback just in case
 
+# Parsed language files are cached as marshal files next to the JSON file; the built executable
+# uses the locales bundle instead
+_CACHE_SUFFIX = ".mar"
+
+# The bundle of all languages (config.LOCALES_BUNDLE_FILENAME) is only used by the built executable,
+# running from source always reads the (possibly edited) JSON files
+
 # --- Functions ---
-def load_translations(lang_code):
-    """Loads translations for the given language code into the global 'translations' dict."""
-    global translations
-    # Ensure lang_dir path is correct (it's relative to the original script location)
-    # Assuming LANG_DIR in config is already set correctly for resource finding
-    relative_filepath = os.path.join(os.path.basename(config.LANG_DIR), f"{lang_code}.json")
-    filepath = get_resource_path(relative_filepath) # Use utils to find it in _MEIPASS or script dir
+def _load_locales_bundle():
+    """Fills _lang_cache from the prebuilt locales bundle once, if running bundled and the file exists."""
+    global _bundle_checked
+    if _bundle_checked:
+        return
+    _bundle_checked = True
+    if not getattr(sys, 'frozen', False):
+        return
+    bundle_path = get_resource_path(os.path.join(os.path.basename(config.LANG_DIR), config.LOCALES_BUNDLE_FILENAME))
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            translations = json.load(f)
-        print(f"Successfully loaded translations for: {lang_code}")
-        return True
+        with open(bundle_path, 'rb') as f:
+            locales = pickle.load(f) # Shipped with the executable, not user-supplied
+        _lang_cache.update((code, _intern_keys(data)) for code, data in locales.items())
     except FileNotFoundError:
-        print(f"ERROR: Language file not found: {filepath}")
-        if lang_code != config.DEFAULT_LANG:
-             print(f"Falling back to {config.DEFAULT_LANG}.")
-             if load_translations(config.DEFAULT_LANG):
-                 return True
-             else:
-                 translations = {}
-                 return False
-        else:
-             translations = {}
-             return False
-    except json.JSONDecodeError as e:
-        print(f"ERROR: Failed to parse language file {filepath}: {e}")
-        translations = {}
-        return False
+        pass # Built without the bundle: fall back to the JSON files
     except Exception as e:
-        print(f"ERROR: Unexpected error loading language file {filepath}: {e}")
-        translations = {}
-        return False
+        log.warning("Could not load locales bundle %s: %s", bundle_path, e)
+
+def _intern_keys(data):
+    """Returns the translations with interned keys, so lookups with the (interned) literal keys compare by identity."""
+    return {sys.intern(key): value for key, value in data.items()}
+
+def _read_file(filepath):
+    """Returns the content of a small file as bytes, with a single read and no buffered file object."""
+    fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_BINARY', 0)) # O_BINARY only exists on Windows
+    try:
+        return os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
+def _read_translation_cache(filepath):
+    """Returns the cached translations if a cache at least as new as the JSON file exists, otherwise None."""
+    json_mtime = os.path.getmtime(filepath) # Raises FileNotFoundError if the language file is missing
+    cache_path = filepath + _CACHE_SUFFIX
+    try:
+        if os.path.getmtime(cache_path) < json_mtime:
+            return None # Stale cache
+        cached = marshal.loads(_read_file(cache_path)) # One read; marshal.load() on a file object reads piecewise
+    except (OSError, EOFError, ValueError, TypeError):
+        return None # Missing or corrupt cache
+    return cached if isinstance(cached, dict) else None
+
+def _write_translation_cache(filepath, data):
+    """Writes the parsed translations next to the JSON file (best effort, e.g. skipped if read-only)."""
+    cache_path = filepath + _CACHE_SUFFIX
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(data, f)
+        os.replace(tmp_path, cache_path) # Never leave a half-written cache behind
+    except (OSError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _use_translations(loaded):
+    """Makes loaded the active translations dict."""
+    global translations, _key_lengths
+    translations = loaded
+    _key_lengths = frozenset(map(len, loaded))
+
+def load_translations(lang_code):
+    """
+    Loads translations for the given language code into the global 'translations' dict.
+    Falls back to config.DEFAULT_LANG if the language file does not exist.
+    """
+    _msg_cache.clear() # Cached messages belong to the previously loaded language
+    _fmt_cache.clear()
+    _load_locales_bundle()
+
+    # Requested language first, then the default (once, if they are the same)
+    for code in dict.fromkeys([lang_code, config.DEFAULT_LANG]):
+        if code in _lang_cache:
+            # Switching back to a language used before: no file access
+            _use_translations(_lang_cache[code])
+            return True
+        # Ensure lang_dir path is correct (it's relative to the original script location)
+        # Assuming LANG_DIR in config is already set correctly for resource finding
+        relative_filepath = os.path.join(os.path.basename(config.LANG_DIR), f"{code}.json")
+        filepath = get_resource_path(relative_filepath) # Use utils to find it in _MEIPASS or script dir
+        try:
+            loaded = _read_translation_cache(filepath)
+            if loaded is None:
+                loaded = _json_loads(_read_file(filepath)) # UTF-8 bytes, decoded by the parser
+                loaded = _intern_keys(loaded) # marshal keeps them interned in the cache
+                _write_translation_cache(filepath, loaded)
+        except FileNotFoundError:
+            log.error("Language file not found: %s", filepath)
+            if code != config.DEFAULT_LANG:
+                log.info("Falling back to %s.", config.DEFAULT_LANG)
+            continue
+        except json.JSONDecodeError as e:
+            log.error("Failed to parse language file %s: %s", filepath, e)
+            break
+        except Exception as e:
+            log.error("Unexpected error loading language file %s: %s", filepath, e)
+            break
+        # Only replace the global dict once a file was loaded completely
+        _use_translations(loaded)
+        _lang_cache[code] = loaded
+        log.info("Successfully loaded translations for: %s", code)
+        return True
+
+    _use_translations({})
+    return False
 
 def set_language(lang_code):
     """Sets the current language for the application and loads its translations."""
@@ -55,33 +154,44 @@ def set_language(lang_code):
             current_language = lang_code
             return True
         else:
-            print(f"ERROR: Failed to set language to {lang_code}, even after fallback attempt.")
+            log.error("Failed to set language to %s, even after fallback attempt.", lang_code)
             current_language = lang_code # Reflect the attempted language
             return False
     else:
-        print(f"Warning: Unsupported language code '{lang_code}'. Language not changed.")
+        log.warning("Unsupported language code '%s'. Language not changed.", lang_code)
         return False
 
+def _lookup(key):
+    """Returns the translation for a key, or "[key]" if there is none (only called on cache misses)."""
+    key_str = key if key.__class__ is str else str(key) # Keys are nearly always str already
+    # Missing keys are mostly rejected by their length, without hashing the key
+    message = translations.get(key_str) if len(key_str) in _key_lengths else None
+    if message is None:
+        message = f"[{key_str}]" # Only built for missing keys
+    return message
+
 def _(key, **kwargs):
     """Gets the translated string for a key, falling back to the key itself."""
-    message = translations.get(str(key), f"[{key}]")
-    if kwargs:
-        try:
-            message = message.format(**kwargs)
-        except KeyError as e:
-            print(f"Warning: Missing placeholder {e} in translation for key '{key}'")
-        except Exception as e:
-            print(f"Warning: Error formatting translation for key '{key}' with args {kwargs}: {e}")
-            message = translations.get(str(key), f"[{key}]")
-    return message
+    if not kwargs:
+        # Fast path for plain labels: one dict lookup per call
+        message = _msg_cache.get(key)
+        if message is None:
+            message = _msg_cache[key] = _lookup(key)
+        return message
+    message = _fmt_cache.get(key)
+    if message is None:
+        message = _fmt_cache[key] = _lookup(key)
+    try:
+        message = message.format_map(kwargs) # Uses kwargs as is instead of unpacking it into a new dict
+    except KeyError as e:
+        log.warning("Missing placeholder %s in translation for key '%s'", e, key)
+    except Exception as e:
+        log.warning("Error formatting translation for key '%s' with args %s: %s", key, kwargs, e)
+    return message # The unformatted template if formatting failed
 
 # --- Modified Initialization Function ---
-def initialize_translations():
-    """
-    Detects system language and loads translations, falling back to default.
-    Sets the initial current_language.
-    """
-    global current_language # We are setting the global variable
+def _detect_system_language():
+    """Detects the system language; returns it if supported, otherwise config.DEFAULT_LANG."""
     detected_lang = None
     try:
         # Get the default locale tuple (e.g., ('en_US', 'cp1252'), ('de_DE', 'UTF-8'))
@@ -90,46 +200,99 @@ def initialize_translations():
         if locale_info and locale_info[0]:
             # Extract the language part (e.g., 'en' from 'en_US', 'de' from 'de_DE')
             detected_lang = locale_info[0].split('_')[0].lower()
-            print(f"Detected system language code: {detected_lang}")
+            log.info("Detected system language code: %s", detected_lang)
         else:
-            print("Could not detect system locale information.")
+            log.info("Could not detect system locale information.")
     except Exception as e:
         # Catch potential errors during locale detection (e.g., unsupported locale)
-        print(f"Warning: Error detecting system locale: {e}")
+        log.warning("Error detecting system locale: %s", e)
 
     # Determine the target language
     target_lang = config.DEFAULT_LANG # Start with the fallback default
     if detected_lang and detected_lang in config.SUPPORTED_LANGS:
         # If detected language is supported, use it
         target_lang = detected_lang
-        print(f"System language '{target_lang}' is supported. Setting as initial language.")
+        log.info("System language '%s' is supported. Setting as initial language.", target_lang)
     else:
         # If detected language is not supported or detection failed, use default
         if detected_lang:
-            print(f"System language '{detected_lang}' is not supported. Falling back to default '{config.DEFAULT_LANG}'.")
+            log.info("System language '%s' is not supported. Falling back to default '%s'.", detected_lang, config.DEFAULT_LANG)
         else:
-            print(f"Falling back to default language '{config.DEFAULT_LANG}'.")
+            log.info("Falling back to default language '%s'.", config.DEFAULT_LANG)
 
+    return target_lang
+
+def _load_initial_language(target_lang):
+    """Loads the initial language, falling back to default. Sets current_language."""
+    global current_language # We are setting the global variable
     # Load the determined target language
-    print(f"Initializing translations with language: {target_lang}")
+    log.info("Initializing translations with language: %s", target_lang)
     if load_translations(target_lang):
         current_language = target_lang # Update the global variable successfully
     else:
          # If loading the target language failed, try the ultimate fallback (config.DEFAULT_LANG)
-         print(f"FATAL: Could not load initial language file '{target_lang}'. Attempting fallback '{config.DEFAULT_LANG}'.")
+         log.critical("Could not load initial language file '%s'. Attempting fallback '%s'.", target_lang, config.DEFAULT_LANG)
          if target_lang != config.DEFAULT_LANG:
              if load_translations(config.DEFAULT_LANG):
                  current_language = config.DEFAULT_LANG # Fallback succeeded
              else:
                  # Both detected/initial and fallback failed
-                 print(f"FATAL: Could not load fallback language file '{config.DEFAULT_LANG}'. UI text will be missing.")
+                 log.critical("Could not load fallback language file '%s'. UI text will be missing.", config.DEFAULT_LANG)
                  current_language = config.DEFAULT_LANG # Set to default code anyway
-                 translations = {} # Ensure translations are empty
+                 _use_translations({}) # Ensure translations are empty
          else:
              # Default language itself failed
-             print(f"FATAL: Could not load default language file '{config.DEFAULT_LANG}'. UI text will be missing.")
+             log.critical("Could not load default language file '%s'. UI text will be missing.", config.DEFAULT_LANG)
              current_language = config.DEFAULT_LANG
-             translations = {}
+             _use_translations({})
+
+def start_language_detection():
+    """
+    Starts detecting the system language in a background thread, so it overlaps with other startup work.
+    The next initialize_translations() call uses its result.
+    """
+    global _detection
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(lang=_detect_system_language()),
+                              name="locale-detection", daemon=True)
+    thread.start()
+    _detection = (thread, result)
+
+def initialize_translations(detection_timeout=None, on_language_detected=None):
+    """
+    Detects system language and loads translations, falling back to default.
+    Sets the initial current_language.
+    If start_language_detection() was called before, waits at most detection_timeout seconds (None: no limit)
+    for its result. If the detection takes longer, the default language is loaded instead and on_language_detected
+    is called from the detection thread with the detected language once it is known, unless the language was
+    changed in the meantime (the GUI posts it to the Tk thread).
+    """
+    global _detection
+    if _detection is None:
+        _load_initial_language(_detect_system_language())
+        return
+
+    thread, result = _detection
+    _detection = None
+    thread.join(detection_timeout)
+    if not thread.is_alive():
+        _load_initial_language(result.get('lang', config.DEFAULT_LANG))
+        return
+
+    log.warning("System language detection is taking too long. Starting with '%s'.", config.DEFAULT_LANG)
+    _load_initial_language(config.DEFAULT_LANG)
+    if on_language_detected is None:
+        return
+    initial_language = current_language
+
+    def apply_when_detected():
+        thread.join()
+        detected_lang = result.get('lang', config.DEFAULT_LANG)
+        # Don't override a language the user picked in the meantime
+        if current_language == initial_language and detected_lang != current_language:
+            on_language_detected(detected_lang)
+
+    threading.Thread(target=apply_when_detected, name="locale-detection-apply", daemon=True).start()
 
 # --- Initial Load ---
 # No initial call here, called explicitly from gui.py startup
@@ -2,35 +2,37 @@
 import re
 import os
 import sys
+from functools import lru_cache
 
+_CLEAN_RE = re.compile(r'[ /.\-+()]+')
+
+# Bounded: besides the column names, the cleaner also sanitizes user-typed TG-Codes for export file names
+IDENTIFIER_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=IDENTIFIER_CACHE_SIZE)
 def clean_sql_identifier(name):
     """Cleans a string to be a valid SQL identifier (table/column name)."""
     if not isinstance(name, str): return ""
-    name = re.sub(r'[ /.\-+()]+', '_', name)
-    # Specific replacements needed *before* stripping underscore if they create leading/trailing ones
-    name = name.replace('ET_THC_NOx', 'ET_THC_NOx') # Keep as is
-    name = name.replace('ZT_THC_NOx', 'ZT_THC_NOx') # Keep as is
-    name = name.strip('_')
+    name = _CLEAN_RE.sub('_', name).strip('_')
     if name and name[0].isdigit(): name = '_' + name
     return name
 
+_PLURAL_SUFFIXES = {'e': 'n', 's': 'es'}
+
+@lru_cache(maxsize=IDENTIFIER_CACHE_SIZE)
 def create_normalized_table_name(base_name):
     """Creates a pluralized table name for normalized columns."""
     clean_name = clean_sql_identifier(base_name)
     if not clean_name: return None
-    # Simple pluralization rules (adjust if needed)
-    if clean_name.endswith('e'): return f"{clean_name}n"
-    elif clean_name.endswith('s'): return f"{clean_name}es"
-    else: return f"{clean_name}s"
+    # Simple pluralization rules (adjust if needed), keyed by the last character
+    return clean_name + _PLURAL_SUFFIXES.get(clean_name[-1], 's')
+
+# PyInstaller creates a temp folder and stores path in _MEIPASS;
+# not running in a bundle, use the script's directory
+_BASE_PATH = getattr(sys, '_MEIPASS', None) or os.path.abspath(os.path.dirname(__file__))
 
+@lru_cache(maxsize=256)
 def get_resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-    except Exception:
-        # Not running in a bundle, use the script's directory
-        base_path = os.path.abspath(os.path.dirname(__file__))
-
-    return os.path.join(base_path, relative_path)
+    return os.path.join(_BASE_PATH, relative_path)
 